@@ -2,8 +2,17 @@ from datetime import datetime, timedelta
 
 
 class DashboardAgent:
-    def __init__(self, db_tool):
+    def __init__(self, db_tool, reference_cache=None, analytics=None, cache=None, cache_ttl: float = 60):
+        """
+        `analytics` is an optional ColumnarAnalyticsEngine; when set, metrics are
+        computed from its in-memory snapshot instead of querying MongoDB.
+        `cache` is an optional SharedCache holding metric results for `cache_ttl` seconds.
+        """
         self.db = db_tool
+        self.reference_cache = reference_cache
+        self.analytics = analytics
+        self.cache = cache
+        self.cache_ttl = cache_ttl
 
     def handle_query(self, prompt: str):
         """
@@ -12,28 +21,42 @@ class DashboardAgent:
         prompt = prompt.lower()
 
         if "revenue" in prompt:
-            return self.total_revenue()
+            return self._cached("total_revenue", self.total_revenue)
         elif "outstanding payments" in prompt:
-            return self.outstanding_payments()
+            return self._cached("outstanding_payments", self.outstanding_payments)
         elif "inactive clients" in prompt:
-            return self.inactive_clients()
+            return self._cached("inactive_clients", self.inactive_clients)
         elif "birthday" in prompt:
-            return self.birthday_reminders()
+            return self._cached(f"birthday_reminders:{datetime.today().date()}", self.birthday_reminders)
         elif "new clients" in prompt:
-            return self.new_clients_this_month()
+            return self._cached("new_clients_this_month", self.new_clients_this_month)
         elif "enrollment trends" in prompt:
-            return self.enrollment_trends()
+            return self._cached("enrollment_trends", self.enrollment_trends)
         elif "top service" in prompt or "highest enrollment" in prompt:
-            return self.top_services()
+            return self._cached("top_services", self.top_services)
         elif "completion rate" in prompt:
-            return self.course_completion_rates()
+            return self._cached("course_completion_rates", self.course_completion_rates)
         elif "attendance" in prompt and "percentage" in prompt:
-            return self.attendance_by_class(prompt)
+            return self._cached(f"attendance_by_class:{prompt}", self.attendance_by_class, prompt)
         elif "drop-off" in prompt:
-            return self.drop_off_rates()
+            return self._cached("drop_off_rates", self.drop_off_rates)
         else:
             return {"message": "Query not recognized for dashboard agent."}
 
+    def _cached(self, key: str, compute, *args):
+        """
+        Serve a metric from the shared cache; only one worker recomputes it when it expires.
+        Error results are never cached.
+        """
+        if not self.cache:
+            return compute(*args)
+        return self.cache.get_or_compute(
+            f"dashboard:{key}",
+            self.cache_ttl,
+            lambda: compute(*args),
+            should_cache=lambda result: "error" not in result,
+        )
+
     # ----------------------------------------
     # Revenue Metrics
     # ----------------------------------------
@@ -43,6 +66,9 @@ class DashboardAgent:
         Returns the total revenue by summing all 'paid' values in the 'payments' collection.
         """
         try:
+            if self.analytics:
+                return {"total_revenue": self.analytics.total_revenue()}
+
             pipeline = [
                 {"$group": {"_id": None, "total": {"$sum": "$paid"}}}
             ]
@@ -59,6 +85,9 @@ class DashboardAgent:
         Calculates outstanding payments by comparing order amount vs paid amount.
         """
         try:
+            if self.analytics:
+                return {"outstanding_dues": self.analytics.outstanding_payments()}
+
             orders = self.db.find("orders", {})
             payments = self.db.find("payments", {})
 
@@ -84,6 +113,9 @@ class DashboardAgent:
         Returns the number of clients whose status is marked as 'inactive'.
         """
         try:
+            if self.analytics:
+                return {"inactive_clients": self.analytics.inactive_clients()}
+
             clients = self.db.find("clients", {"status": "inactive"})
             return {"inactive_clients": len(clients)}
         except Exception as e:
@@ -98,6 +130,9 @@ class DashboardAgent:
             this_month = today.month
             this_day = today.day
 
+            if self.analytics:
+                return {"birthdays_today": self.analytics.birthday_reminders(this_month, this_day)}
+
             clients = self.db.find("clients", {
                 "dob": {
                     "$regex": f"-{this_month:02d}-{this_day:02d}$"
@@ -113,6 +148,9 @@ class DashboardAgent:
         """
         try:
             first_day = datetime.today().replace(day=1)
+            if self.analytics:
+                return {"new_clients": self.analytics.new_clients_since(first_day.isoformat())}
+
             clients = self.db.find("clients", {
                 "created_at": {"$gte": first_day.isoformat()}
             })
@@ -129,6 +167,9 @@ class DashboardAgent:
         Aggregates and returns count of enrollments (orders) by service_name.
         """
         try:
+            if self.analytics:
+                return {"enrollment_trends": self.analytics.enrollment_trends()}
+
             pipeline = [
                 {"$group": {"_id": "$service_name", "count": {"$sum": 1}}},
                 {"$sort": {"count": -1}}
@@ -143,6 +184,9 @@ class DashboardAgent:
         Returns the top 3 most enrolled services based on order count.
         """
         try:
+            if self.analytics:
+                return {"top_services": self.analytics.enrollment_trends(limit=3)}
+
             pipeline = [
                 {"$group": {"_id": "$service_name", "count": {"$sum": 1}}},
                 {"$sort": {"count": -1}},
@@ -158,7 +202,10 @@ class DashboardAgent:
         Returns a list of courses with their respective completion rates.
         """
         try:
-            courses = self.db.find("courses", {})
+            if self.reference_cache:
+                courses = self.reference_cache.courses()
+            else:
+                courses = self.db.find("courses", {})
             completions = [
                 {"course": c["title"], "completion_rate": c.get("completion_rate", 0)}
                 for c in courses
@@ -183,6 +230,9 @@ class DashboardAgent:
             if not class_name:
                 return {"error": "Class name not specified"}
 
+            if self.analytics:
+                return {"class": class_name, "attendance_percentage": self.analytics.attendance_percentage(class_name)}
+
             records = self.db.find("attendance", {"class": {"$regex": class_name, "$options": "i"}})
             total = len(records)
             present = sum(1 for r in records if r.get("present") is True)
@@ -197,6 +247,9 @@ class DashboardAgent:
         Counts how many clients have missed 2 or more sessions (drop-off risk).
         """
         try:
+            if self.analytics:
+                return {"drop_off_count": self.analytics.drop_off_count()}
+
             records = self.db.find("attendance", {})
             dropout_map = {}
             for r in records:
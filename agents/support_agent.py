@@ -14,12 +14,17 @@ class SupportAgent:
     5. External API usage for enquiry/order creation
     """
 
-    def __init__(self, db_tool, api_tool):
+    def __init__(self, db_tool, api_tool, reference_cache=None, cache=None, cache_ttl: float = 30):
         """
         Initialize SupportAgent with database and external API tools.
+        An optional ReferenceDataCache answers class queries from memory,
+        and an optional SharedCache keeps client lookups for `cache_ttl` seconds.
         """
         self.db_tool = db_tool
         self.api_tool = api_tool
+        self.reference_cache = reference_cache
+        self.cache = cache
+        self.cache_ttl = cache_ttl
         # self.translator = Translator()
 
     def translate_prompt(self, prompt: str) -> str:
@@ -74,9 +79,21 @@ class SupportAgent:
                 return {"error": "Please specify name, email, or phone to search."}
 
             field, value = query.groups()
-            client = self.db_tool.find_one("clients", {
-                field: {"$regex": value, "$options": "i"}
-            })
+
+            def lookup():
+                return self.db_tool.find_one("clients", {
+                    field: {"$regex": value, "$options": "i"}
+                })
+
+            if self.cache:
+                client = self.cache.get_or_compute(
+                    f"support:client:{field}:{value}",
+                    self.cache_ttl,
+                    lookup,
+                    should_cache=lambda result: result is not None,
+                )
+            else:
+                client = lookup()
 
             if client:
                 return {"client": client}
@@ -217,7 +234,10 @@ class SupportAgent:
         """
         try:
             today = datetime.today().isoformat()
-            classes = self.db_tool.find("classes", {"start_time": {"$gte": today}})
+            if self.reference_cache:
+                classes = self.reference_cache.upcoming_classes(today)
+            else:
+                classes = self.db_tool.find("classes", {"start_time": {"$gte": today}})
             for cls in classes:
                 if "_id" in cls:
                     cls["_id"] = str(cls["_id"])
@@ -229,17 +249,26 @@ class SupportAgent:
 
     def filter_classes_by_instructor(self, prompt: str):
         try:
-            filters={}
+            instructor = None
+            status = None
             match = re.search(r"instructor\s+(\w+)", prompt)
             if match:
-                filters["instructor"] = {"$regex": match.group(1), "$options": "i"}
+                instructor = match.group(1)
             
             if "completed" in prompt:
-                filters["status"] = "completed"
+                status = "completed"
             elif "scheduled" in prompt:
-                filters["status"] = "scheduled"
+                status = "scheduled"
             
-            records = self.db_tool.find("classes", filters)
+            if self.reference_cache:
+                records = self.reference_cache.filter_classes(instructor=instructor, status=status)
+            else:
+                filters = {}
+                if instructor:
+                    filters["instructor"] = {"$regex": instructor, "$options": "i"}
+                if status:
+                    filters["status"] = status
+                records = self.db_tool.find("classes", filters)
             for record in records:
                 if "_id" in record:
                     record["_id"] = str(record["_id"])
@@ -259,7 +288,7 @@ class SupportAgent:
         try:
             client_name = prompt.lower().replace("create enquiry for", "").strip()
 
-            enquiry = self.api_tool.create_enquiry(client_name)
+            enquiry = self.api_tool.create_client_enquiry(name=client_name)
             self.db_tool.insert("enquiries", enquiry)
 
             return {"message": f"Enquiry created for {client_name}", "enquiry_id": enquiry["enquiry_id"]}
@@ -1,10 +1,16 @@
 # main.py
 import os
+import time
 from fastapi import FastAPI, Body, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from tools.mongodb_tool import MongoDBTool
 from tools.externalApi_tool import ExternalApiTool
+from tools.reference_cache import ReferenceDataCache
+from tools.deadline import run_with_deadline
+from tools.shared_cache import SharedCache, SQLiteCacheBackend, RedisCacheBackend
+from services.load_shedder import ConcurrencyLimiter, Overloaded
 from agents.support_agent import SupportAgent
 from pymongo.errors import PyMongoError
 from agents.dashboard_agent import DashboardAgent
@@ -15,6 +21,36 @@ load_dotenv()
 # Configuration
 MONGO_URI = os.getenv("MONGO_URI")
 MONGO_DB = os.getenv("MONGO_DB")
+REFERENCE_CACHE_ENABLED = os.getenv("REFERENCE_CACHE_ENABLED", "true").lower() == "true"
+REFERENCE_CACHE_REFRESH_SECONDS = float(os.getenv("REFERENCE_CACHE_REFRESH_SECONDS", "300"))
+REFERENCE_CACHE_CHANGE_STREAMS = os.getenv("REFERENCE_CACHE_CHANGE_STREAMS", "false").lower() == "true"
+REFERENCE_CACHE_CONSISTENCY = os.getenv("REFERENCE_CACHE_CONSISTENCY", "eventual")
+EXTERNAL_API_URL = os.getenv("EXTERNAL_API_URL")
+EXTERNAL_API_TIMEOUT_SECONDS = float(os.getenv("EXTERNAL_API_TIMEOUT_SECONDS", "2"))
+EXTERNAL_API_MAX_RETRIES = int(os.getenv("EXTERNAL_API_MAX_RETRIES", "2"))
+EXTERNAL_API_HEDGE_AFTER_MS = os.getenv("EXTERNAL_API_HEDGE_AFTER_MS")
+DASHBOARD_BACKEND = os.getenv("DASHBOARD_BACKEND", "mongo")
+COLUMNAR_REFRESH_SECONDS = float(os.getenv("COLUMNAR_REFRESH_SECONDS", "60"))
+COLUMNAR_FULL_REFRESH_EVERY = int(os.getenv("COLUMNAR_FULL_REFRESH_EVERY", "10"))
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+EXPORT_PARTITIONS = int(os.getenv("EXPORT_PARTITIONS", "4"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+EXPORT_MAX_CONCURRENCY = int(os.getenv("EXPORT_MAX_CONCURRENCY", "1"))
+EXPORT_MAX_QUEUE = int(os.getenv("EXPORT_MAX_QUEUE", "0"))
+SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND", "none")
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH")
+SHARED_CACHE_CONSISTENCY = os.getenv("SHARED_CACHE_CONSISTENCY", "eventual")
+REDIS_URL = os.getenv("REDIS_URL")
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60"))
+SUPPORT_CACHE_TTL_SECONDS = float(os.getenv("SUPPORT_CACHE_TTL_SECONDS", "30"))
+
+# Request budgets: support traffic is customer-facing, dashboard traffic is analytics.
+SUPPORT_DEADLINE_SECONDS = float(os.getenv("SUPPORT_DEADLINE_SECONDS", "5"))
+SUPPORT_MAX_CONCURRENCY = int(os.getenv("SUPPORT_MAX_CONCURRENCY", "16"))
+SUPPORT_MAX_QUEUE = int(os.getenv("SUPPORT_MAX_QUEUE", "64"))
+DASHBOARD_DEADLINE_SECONDS = float(os.getenv("DASHBOARD_DEADLINE_SECONDS", "15"))
+DASHBOARD_MAX_CONCURRENCY = int(os.getenv("DASHBOARD_MAX_CONCURRENCY", "4"))
+DASHBOARD_MAX_QUEUE = int(os.getenv("DASHBOARD_MAX_QUEUE", "8"))
 
 # FastAPI App
 app = FastAPI(
@@ -35,11 +71,76 @@ app.add_middleware(
 # Initialize tools and agent
 try:
     mongo_tool = MongoDBTool(MONGO_URI, MONGO_DB)
-    external_api = ExternalApiTool()
-    support_agent = SupportAgent(mongo_tool, external_api)
+    external_api = ExternalApiTool(
+        base_url=EXTERNAL_API_URL,
+        timeout=EXTERNAL_API_TIMEOUT_SECONDS,
+        max_retries=EXTERNAL_API_MAX_RETRIES,
+        hedge_after=float(EXTERNAL_API_HEDGE_AFTER_MS) / 1000 if EXTERNAL_API_HEDGE_AFTER_MS else None,
+    )
+    reference_cache = None
+    if REFERENCE_CACHE_ENABLED:
+        reference_cache = ReferenceDataCache(
+            mongo_tool,
+            refresh_interval=REFERENCE_CACHE_REFRESH_SECONDS,
+            use_change_streams=REFERENCE_CACHE_CHANGE_STREAMS,
+            consistency=REFERENCE_CACHE_CONSISTENCY,
+        )
+        reference_cache.start()
+
+    # Result cache shared by all uvicorn/gunicorn workers on this host
+    shared_cache = None
+    if SHARED_CACHE_BACKEND == "sqlite":
+        shared_cache = SharedCache(SQLiteCacheBackend(SHARED_CACHE_PATH), consistency=SHARED_CACHE_CONSISTENCY)
+    elif SHARED_CACHE_BACKEND == "redis":
+        import redis
+        shared_cache = SharedCache(
+            RedisCacheBackend(redis.Redis.from_url(REDIS_URL)), consistency=SHARED_CACHE_CONSISTENCY
+        )
+    elif SHARED_CACHE_BACKEND != "none":
+        raise RuntimeError(f"Unknown SHARED_CACHE_BACKEND: {SHARED_CACHE_BACKEND}")
+
+    support_agent = SupportAgent(
+        mongo_tool, external_api, reference_cache,
+        cache=shared_cache, cache_ttl=SUPPORT_CACHE_TTL_SECONDS,
+    )
+
+    analytics_engine = None
+    if DASHBOARD_BACKEND == "columnar":
+        # Imported lazily so NumPy is only needed when the columnar backend is enabled.
+        from tools.columnar_engine import ColumnarAnalyticsEngine
+        analytics_engine = ColumnarAnalyticsEngine(
+            mongo_tool,
+            refresh_interval=COLUMNAR_REFRESH_SECONDS,
+            full_refresh_every=COLUMNAR_FULL_REFRESH_EVERY,
+        )
+        analytics_engine.start()
+    elif DASHBOARD_BACKEND != "mongo":
+        raise RuntimeError(f"Unknown DASHBOARD_BACKEND: {DASHBOARD_BACKEND}")
 except PyMongoError as e:
     raise RuntimeError(f"Could not initialize DB tools: {e}")
 
+support_limiter = ConcurrencyLimiter("support", SUPPORT_MAX_CONCURRENCY, SUPPORT_MAX_QUEUE)
+dashboard_limiter = ConcurrencyLimiter("dashboard", DASHBOARD_MAX_CONCURRENCY, DASHBOARD_MAX_QUEUE)
+# Exports are long-running; keep them from using up the threadpool the agents share.
+export_limiter = ConcurrencyLimiter("export", EXPORT_MAX_CONCURRENCY, EXPORT_MAX_QUEUE)
+
+
+async def run_agent(limiter: ConcurrencyLimiter, budget: float, fn, *args):
+    """
+    Run a blocking agent call under the endpoint's concurrency limit and deadline.
+    Time spent waiting in the queue counts against the deadline.
+    """
+    deadline = time.monotonic() + budget
+    try:
+        async with limiter.slot(timeout=budget):
+            return await run_in_threadpool(run_with_deadline, deadline, fn, *args)
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"{limiter.name} endpoint is overloaded, please retry later.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
 # Health check
 @app.get("/ping")
 def ping():
@@ -52,8 +153,12 @@ async def handle_query(prompt: str = Body(..., embed=True)):
     Process a natural language prompt using SupportAgent.
     """
     try:
-        result = support_agent.handle_client_query(prompt)
+        result = await run_agent(
+            support_limiter, SUPPORT_DEADLINE_SECONDS, support_agent.handle_client_query, prompt
+        )
         return {"response": result}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal Error: {str(e)}")
 
@@ -64,8 +169,44 @@ async def handle_dashboard_query(prompt: str = Body(..., embed=True)):
     Process a natural language prompt using DashboardAgent.
     """
     try:
-        dashboard_agent = DashboardAgent(mongo_tool)
-        result = dashboard_agent.handle_query(prompt)
+        dashboard_agent = DashboardAgent(
+            mongo_tool, reference_cache, analytics_engine,
+            cache=shared_cache, cache_ttl=DASHBOARD_CACHE_TTL_SECONDS,
+        )
+        result = await run_agent(
+            dashboard_limiter, DASHBOARD_DEADLINE_SECONDS, dashboard_agent.handle_query, prompt
+        )
         return {"response": result}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Error: {str(e)}")
+
+# Bulk snapshot export
+@app.post("/export")
+async def handle_export(
+    collections: list[str] = Body(None),
+    format: str = Body("parquet"),
+    incremental: bool = Body(False),
+):
+    """
+    Export collections to compressed Parquet or Arrow IPC files under EXPORT_DIR.
+    """
+    # Imported lazily so PyArrow is only needed when exports are used.
+    from tools.snapshot_exporter import SnapshotExporter
+
+    try:
+        exporter = SnapshotExporter(mongo_tool, EXPORT_DIR, format, EXPORT_PARTITIONS, EXPORT_BATCH_SIZE)
+        async with export_limiter.slot():
+            summary = await run_in_threadpool(exporter.export, collections, incremental)
+        return {"exports": summary}
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=429,
+            detail="An export is already running, please retry later.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal Error: {str(e)}")
@@ -0,0 +1,77 @@
+# services/bench_create_order.py
+"""
+Measure throughput and tail latency of SupportAgent.create_order_flow against
+the stub external service, without MongoDB.
+
+    uvicorn services.stub_external_api:app --port 8001
+    python -m services.bench_create_order --url http://127.0.0.1:8001 --requests 2000 --concurrency 32
+"""
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from tools.externalApi_tool import ExternalApiTool
+from agents.support_agent import SupportAgent
+
+
+class InMemoryDBTool:
+    """
+    Minimal stand-in for MongoDBTool with a single client, so only the external call is measured.
+    """
+
+    def __init__(self):
+        self.client = {"_id": "c001", "name": "Priya Sharma"}
+        self.inserted = []
+
+    def find_one(self, collection_name: str, query: dict):
+        return self.client if collection_name == "clients" else None
+
+    def insert(self, collection_name: str, document: dict):
+        self.inserted.append(document)
+        return len(self.inserted)
+
+
+def percentile(samples: list, pct: float):
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark create_order_flow")
+    parser.add_argument("--url", default="http://127.0.0.1:8001")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--hedge-after-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    api_tool = ExternalApiTool(
+        base_url=args.url,
+        max_retries=args.retries,
+        hedge_after=args.hedge_after_ms / 1000 if args.hedge_after_ms else None,
+    )
+    db_tool = InMemoryDBTool()
+    agent = SupportAgent(db_tool, api_tool)
+
+    def one_request(_):
+        started = time.perf_counter()
+        result = agent.handle_client_query("Create an order for Yoga Beginner for Priya Sharma")
+        return time.perf_counter() - started, "error" not in result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one_request, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    api_tool.close()
+
+    latencies = sorted(latency * 1000 for latency, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+
+    print(f"requests:    {args.requests} (concurrency {args.concurrency})")
+    print(f"errors:      {errors}")
+    print(f"throughput:  {args.requests / elapsed:.1f} req/s")
+    print(f"latency ms:  mean {statistics.mean(latencies):.1f}  p50 {percentile(latencies, 50):.1f}  "
+          f"p95 {percentile(latencies, 95):.1f}  p99 {percentile(latencies, 99):.1f}  max {latencies[-1]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
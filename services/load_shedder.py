@@ -0,0 +1,65 @@
+import math
+import time
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class Overloaded(Exception):
+    """
+    Raised when an endpoint's queue is full or a request waited past its deadline.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Service overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    ConcurrencyLimiter
+
+    Bounds how many requests of one endpoint run at once. Up to `max_queue`
+    extra requests wait for a slot; anything beyond that is rejected right
+    away so a burst on one endpoint can't starve the others.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Running plus waiting requests, updated before the first await so same-tick bursts are counted.
+        self._admitted = 0
+        self._avg_latency = 1.0
+
+    def retry_after(self) -> int:
+        """
+        Rough number of seconds until the current queue drains.
+        """
+        batches = max(self._admitted, self.max_concurrency) / self.max_concurrency
+        return max(1, math.ceil(batches * self._avg_latency))
+
+    @asynccontextmanager
+    async def slot(self, timeout: float = None):
+        """
+        Hold one concurrency slot for the duration of the block.
+        """
+        if self._admitted >= self.max_concurrency + self.max_queue:
+            raise Overloaded(self.retry_after())
+
+        self._admitted += 1
+        try:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout)
+            except asyncio.TimeoutError:
+                raise Overloaded(self.retry_after())
+
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                self._semaphore.release()
+                elapsed = time.monotonic() - started
+                self._avg_latency = 0.8 * self._avg_latency + 0.2 * elapsed
+        finally:
+            self._admitted -= 1
@@ -0,0 +1,78 @@
+# services/stub_external_api.py
+"""
+Local stand-in for the external order/enquiry service.
+
+Run it next to the API and point EXTERNAL_API_URL at it:
+
+    uvicorn services.stub_external_api:app --port 8001
+
+Latency and failures are configured through the environment:
+    STUB_LATENCY_MS     base latency per request (default 50)
+    STUB_JITTER_MS      uniform extra latency (default 20)
+    STUB_SLOW_RATE      fraction of requests that hit the slow path (default 0.01)
+    STUB_SLOW_MS        extra latency on the slow path (default 1000)
+    STUB_FAILURE_RATE   fraction of requests answered with a 503 (default 0.0)
+"""
+import os
+import random
+import asyncio
+import datetime
+from fastapi import FastAPI, Body, Header, HTTPException
+
+LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "50"))
+JITTER_MS = float(os.getenv("STUB_JITTER_MS", "20"))
+SLOW_RATE = float(os.getenv("STUB_SLOW_RATE", "0.01"))
+SLOW_MS = float(os.getenv("STUB_SLOW_MS", "1000"))
+FAILURE_RATE = float(os.getenv("STUB_FAILURE_RATE", "0.0"))
+
+app = FastAPI(title="External API Stub")
+
+# Idempotency-Key -> response, so retried and hedged requests return the same record
+_responses = {}
+
+
+async def simulate():
+    delay = LATENCY_MS + random.uniform(0, JITTER_MS)
+    if random.random() < SLOW_RATE:
+        delay += SLOW_MS
+    await asyncio.sleep(delay / 1000)
+
+    if random.random() < FAILURE_RATE:
+        raise HTTPException(status_code=503, detail="Simulated failure")
+
+
+@app.post("/orders")
+async def create_order(payload: dict = Body(...), idempotency_key: str = Header(None)):
+    await simulate()
+    if idempotency_key in _responses:
+        return _responses[idempotency_key]
+
+    order = {
+        "order_id": payload["order_id"],
+        "client_id": payload["client_id"],
+        "service_name": payload["service_name"],
+        "status": "pending",
+        "created_at": datetime.datetime.now().isoformat(),
+    }
+    if idempotency_key:
+        _responses[idempotency_key] = order
+    return order
+
+
+@app.post("/enquiries")
+async def create_enquiry(payload: dict = Body(...), idempotency_key: str = Header(None)):
+    await simulate()
+    if idempotency_key in _responses:
+        return _responses[idempotency_key]
+
+    enquiry = {
+        "enquiry_id": payload["enquiry_id"],
+        "name": payload["name"],
+        "email": payload.get("email"),
+        "phone": payload.get("phone"),
+        "status": "new",
+        "created_at": datetime.datetime.now().isoformat(),
+    }
+    if idempotency_key:
+        _responses[idempotency_key] = enquiry
+    return enquiry
@@ -0,0 +1,67 @@
+import pytest
+from bson import ObjectId
+
+
+def _matches(document: dict, query: dict):
+    """
+    Evaluate the small subset of Mongo queries the tools issue: `$and` and `_id` range operators.
+    Like Mongo, a range only matches `_id`s of the same type as its bound.
+    """
+    if "$and" in query:
+        return all(_matches(document, clause) for clause in query["$and"])
+    if "_id" not in query:
+        return True
+
+    value = document["_id"]
+    for op, bound in query["_id"].items():
+        if type(value) is not type(bound):
+            return False
+        if op == "$gt" and not value > bound:
+            return False
+        if op == "$gte" and not value >= bound:
+            return False
+        if op == "$lt" and not value < bound:
+            return False
+        if op == "$lte" and not value <= bound:
+            return False
+    return True
+
+
+class FakeDBTool:
+    """
+    In-memory stand-in for MongoDBTool backed by {collection: [documents]}.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    def find(self, collection_name: str, query: dict, projection: dict = None):
+        return [dict(d) for d in self.data.get(collection_name, []) if _matches(d, query)]
+
+    def iter_batches(self, collection_name: str, query: dict, batch_size: int):
+        docs = self.find(collection_name, query)
+        for i in range(0, len(docs), batch_size):
+            yield docs[i:i + batch_size]
+
+
+    def id_ranges(self, collection_name: str, query: dict, partitions: int):
+        """
+        Mimic $bucketAuto on _id: sort in BSON type order (strings before ObjectIds) and chunk.
+        """
+        ids = sorted(
+            (d["_id"] for d in self.data.get(collection_name, []) if _matches(d, query)),
+            key=lambda i: (isinstance(i, ObjectId), str(i)),
+        )
+        if not ids:
+            return []
+        size = -(-len(ids) // partitions)
+        starts = list(range(0, len(ids), size))
+        return [
+            {"min": ids[s], "max": ids[starts[n + 1]] if n + 1 < len(starts) else ids[-1]}
+            for n, s in enumerate(starts)
+        ]
+
+
+@pytest.fixture
+def fake_db_tool():
+    return FakeDBTool
@@ -0,0 +1,45 @@
+import pytest
+from bson import ObjectId
+from tools.columnar_engine import ColumnarAnalyticsEngine
+
+
+def make_engine(fake_db_tool, data: dict):
+    engine = ColumnarAnalyticsEngine(fake_db_tool(data))
+    engine.refresh(full=True)
+    return engine
+
+
+def test_string_ids_are_reloaded_instead_of_resumed(fake_db_tool):
+    data = {"clients": [{"_id": "c001", "status": "inactive"}]}
+    engine = make_engine(fake_db_tool, data)
+
+    data["clients"].append({"_id": ObjectId(), "status": "inactive"})
+    engine.refresh()
+
+    assert engine.inactive_clients() == 2
+
+
+def test_object_ids_are_appended_by_watermark(fake_db_tool):
+    data = {"orders": [{"_id": ObjectId(), "order_id": "O1", "service_name": "Yoga", "amount": 10}]}
+    engine = make_engine(fake_db_tool, data)
+
+    data["orders"].append({"_id": ObjectId(), "order_id": "O2", "service_name": "Yoga", "amount": 5})
+    engine.refresh()
+
+    assert engine.enrollment_trends() == [{"_id": "Yoga", "count": 2}]
+
+
+def test_last_payment_per_order_wins(fake_db_tool):
+    data = {
+        "orders": [{"_id": ObjectId(), "order_id": "O1", "amount": 100}],
+        "payments": [
+            {"_id": ObjectId(), "order_id": "O1", "paid": 90},
+            {"_id": ObjectId(), "order_id": "O1", "paid": 30},
+        ],
+    }
+    assert make_engine(fake_db_tool, data).outstanding_payments() == 70
+
+
+def test_full_refresh_every_must_be_positive(fake_db_tool):
+    with pytest.raises(ValueError):
+        ColumnarAnalyticsEngine(fake_db_tool({}), full_refresh_every=0)
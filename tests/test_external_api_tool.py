@@ -0,0 +1,147 @@
+import time
+import asyncio
+import httpx
+import pytest
+from tools.externalApi_tool import CircuitBreaker, ExternalApiError, ExternalApiTool
+
+
+def make_tool(handler, **kwargs):
+    kwargs.setdefault("backoff_base", 0)
+    return ExternalApiTool(base_url="http://external.test", transport=httpx.MockTransport(handler), **kwargs)
+
+
+def order_response(request: httpx.Request):
+    return httpx.Response(200, json={"order_id": request.headers["Idempotency-Key"], "status": "pending"})
+
+
+@pytest.mark.parametrize("status", [503, 429])
+def test_retries_stop_after_max_retries(status):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(status)
+
+    tool = make_tool(handler, max_retries=2)
+    try:
+        with pytest.raises(ExternalApiError):
+            tool.create_order("c001", "Yoga")
+    finally:
+        tool.close()
+    assert len(calls) == 3
+    # Every attempt reuses the same idempotency key.
+    assert len({r.headers["Idempotency-Key"] for r in calls}) == 1
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400)
+
+    tool = make_tool(handler, max_retries=2)
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            tool.create_order("c001", "Yoga")
+    finally:
+        tool.close()
+    assert len(calls) == 1
+
+
+def test_open_breaker_rejects_without_sending():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    tool = make_tool(handler, max_retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    try:
+        for _ in range(2):
+            with pytest.raises(ExternalApiError):
+                tool.create_order("c001", "Yoga")
+        with pytest.raises(ExternalApiError, match="circuit open"):
+            tool.create_order("c001", "Yoga")
+    finally:
+        tool.close()
+    assert len(calls) == 2
+
+
+def test_hedged_request_returns_the_faster_copy():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return order_response(request)
+
+    tool = make_tool(handler, max_retries=0, hedge_after=0.05)
+    try:
+        started = time.monotonic()
+        order = tool.create_order("c001", "Yoga")
+        elapsed = time.monotonic() - started
+    finally:
+        tool.close()
+    assert order["status"] == "pending"
+    assert len(calls) == 2
+    assert elapsed < 0.5
+
+
+def test_failed_first_copy_does_not_fail_hedged_call():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(0.1)
+            raise httpx.ConnectError("connection reset", request=request)
+        await asyncio.sleep(0.2)
+        return order_response(request)
+
+    tool = make_tool(handler, max_retries=0, hedge_after=0.05)
+    try:
+        order = tool.create_order("c001", "Yoga")
+    finally:
+        tool.close()
+    assert order["status"] == "pending"
+    assert len(calls) == 2
+
+
+def test_breaker_opens_after_failure_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+
+def test_half_open_breaker_lets_a_single_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
@@ -0,0 +1,44 @@
+import asyncio
+from services.load_shedder import ConcurrencyLimiter, Overloaded
+
+
+def run_burst(limiter: ConcurrencyLimiter, requests: int, hold: float = 0.05):
+    async def one():
+        try:
+            async with limiter.slot(timeout=5):
+                await asyncio.sleep(hold)
+            return "ok"
+        except Overloaded:
+            return "rejected"
+
+    async def burst():
+        return await asyncio.gather(*(one() for _ in range(requests)))
+
+    return asyncio.run(burst())
+
+
+def test_same_tick_burst_is_limited_to_concurrency_plus_queue():
+    limiter = ConcurrencyLimiter("test", max_concurrency=1, max_queue=1)
+    results = run_burst(limiter, 20)
+    assert results.count("ok") == 2
+    assert results.count("rejected") == 18
+
+
+def test_slots_are_released_after_burst():
+    limiter = ConcurrencyLimiter("test", max_concurrency=2, max_queue=0)
+    assert run_burst(limiter, 5).count("ok") == 2
+    assert run_burst(limiter, 5).count("ok") == 2
+
+
+def test_rejection_carries_retry_after():
+    limiter = ConcurrencyLimiter("test", max_concurrency=1, max_queue=0)
+
+    async def scenario():
+        async with limiter.slot():
+            try:
+                async with limiter.slot():
+                    pass
+            except Overloaded as e:
+                return e.retry_after
+
+    assert asyncio.run(scenario()) >= 1
@@ -0,0 +1,56 @@
+import pytest
+from datetime import datetime
+from tools.reference_cache import ReferenceDataCache
+
+
+CLASSES = [
+    {"_id": 1, "title": "Yoga", "start_time": "2026-10-21T09:00:00", "instructor": "Rina Mehta", "status": "scheduled"},
+    {"_id": 2, "title": "Zumba", "start_time": "2026-10-23T09:00:00", "instructor": "Karan Singh", "status": "scheduled"},
+    {"_id": 3, "title": "Pilates", "start_time": "2026-10-17T09:00:00", "instructor": "Rina Mehta", "status": "completed"},
+    {"_id": 4, "title": "Spin", "start_time": "2026-10-22T09:00:00", "instructor": None, "status": "scheduled"},
+    {"_id": 5, "title": "Stretch", "instructor": "Rina Mehta", "status": "scheduled"},
+]
+
+
+@pytest.fixture
+def cache(fake_db_tool):
+    cache = ReferenceDataCache(fake_db_tool({"classes": CLASSES, "courses": [{"title": "Yoga Beginner"}]}))
+    cache.refresh()
+    return cache
+
+
+def ids(classes: list):
+    return [c["_id"] for c in classes]
+
+
+def test_upcoming_classes_includes_exact_start_and_keeps_load_order(cache):
+    assert ids(cache.upcoming_classes("2026-10-21T09:00:00")) == [1, 2, 4]
+
+
+def test_upcoming_classes_boundaries(cache):
+    assert ids(cache.upcoming_classes("2026-10-21T09:00:01")) == [2, 4]
+    assert ids(cache.upcoming_classes("2026-10-01")) == [1, 2, 3, 4]
+    assert cache.upcoming_classes("2026-11-01") == []
+
+
+def test_instructor_and_status_filters_intersect(cache):
+    assert ids(cache.filter_classes(instructor="rina")) == [1, 3, 5]
+    assert ids(cache.filter_classes(status="scheduled")) == [1, 2, 4, 5]
+    assert ids(cache.filter_classes(instructor="rina", status="completed")) == [3]
+    assert cache.filter_classes(instructor="karan", status="completed") == []
+
+
+def test_non_string_instructors_are_skipped(cache):
+    assert 4 not in ids(cache.filter_classes(instructor="a"))
+    assert ids(cache.filter_classes()) == [1, 2, 3, 4, 5]
+
+
+def test_results_are_copies(cache):
+    cache.filter_classes(instructor="karan")[0]["_id"] = "changed"
+    assert ids(cache.filter_classes(instructor="karan")) == [2]
+
+
+def test_datetime_start_times_are_indexed_as_iso(fake_db_tool):
+    classes = [{"_id": 1, "start_time": datetime(2026, 10, 21, 9)}, {"_id": 2, "start_time": datetime(2026, 10, 19, 9)}]
+    cache = ReferenceDataCache(fake_db_tool({"classes": classes, "courses": []}))
+    assert ids(cache.upcoming_classes("2026-10-20")) == [1]
@@ -0,0 +1,71 @@
+import os
+import stat
+import time
+from bson import ObjectId
+from tools.deadline import run_with_deadline, DeadlineExceeded, remaining_ms
+from tools.shared_cache import SharedCache, SQLiteCacheBackend
+
+
+def test_values_round_trip_as_json(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"))
+    cache = SharedCache(backend)
+    client = {"_id": ObjectId(), "name": "Priya Sharma"}
+
+    assert cache.get_or_compute("client", 60, lambda: client) == client
+    assert cache.get_or_compute("client", 60, lambda: None) == client
+    assert backend.get("client").startswith("{")
+
+
+def test_uncacheable_results_are_not_stored(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"))
+    cache = SharedCache(backend)
+
+    cache.get_or_compute("metric", 60, lambda: {"error": "boom"}, should_cache=lambda r: "error" not in r)
+    assert backend.get("metric") is None
+
+
+def test_cache_file_is_private(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    SQLiteCacheBackend(str(path))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_waiting_for_lock_respects_request_deadline(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"))
+    cache = SharedCache(backend, lock_timeout=30)
+    backend.acquire_lock("metric", 30)
+
+    started = time.monotonic()
+    result = run_with_deadline(time.monotonic() + 0.3, cache.get_or_compute, "metric", 60, lambda: 1)
+
+    assert result == 1
+    assert time.monotonic() - started < 2
+
+
+def test_expired_deadline_falls_through_to_compute(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"))
+    cache = SharedCache(backend)
+
+    def compute():
+        try:
+            remaining_ms()
+        except DeadlineExceeded as e:
+            return {"error": str(e)}
+        return {"total_revenue": 1}
+
+    result = run_with_deadline(
+        time.monotonic() - 0.01, cache.get_or_compute, "metric", 60, compute,
+        should_cache=lambda r: "error" not in r,
+    )
+
+    assert "error" in result
+    assert backend.get("metric") is None
+
+
+def test_strong_consistency_bypasses_the_cache(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"))
+    cache = SharedCache(backend, consistency="strong")
+
+    assert cache.get_or_compute("metric", 60, lambda: 1) == 1
+    assert cache.get_or_compute("metric", 60, lambda: 2) == 2
+    assert backend.get("metric") is None
@@ -0,0 +1,49 @@
+import pyarrow.parquet as pq
+from bson import ObjectId
+from tools.snapshot_exporter import SnapshotExporter
+
+
+def rows(paths: list):
+    return sum(pq.read_table(path).num_rows for path in paths)
+
+
+def test_incremental_export_resumes_after_object_id_watermark(tmp_path, fake_db_tool):
+    data = {"orders": [{"_id": ObjectId(), "order_id": "O1", "amount": 10}]}
+    exporter = SnapshotExporter(fake_db_tool(data), str(tmp_path), partitions=1, batch_size=2)
+
+    first = exporter.export(["orders"], incremental=True)
+    data["orders"].append({"_id": ObjectId(), "order_id": "O2", "amount": 5})
+    second = exporter.export(["orders"], incremental=True)
+
+    assert rows(first["orders"]["files"]) == 1
+    assert rows(second["orders"]["files"]) == 1
+    assert first["orders"]["files"] != second["orders"]["files"]
+
+
+def test_mixed_id_types_are_exported_in_full(tmp_path, fake_db_tool):
+    data = {"clients": [{"_id": "c001", "name": "Priya"}, {"_id": ObjectId(), "name": "Alice"}]}
+    exporter = SnapshotExporter(fake_db_tool(data), str(tmp_path), partitions=1)
+
+    exporter.export(["clients"], incremental=True)
+    again = exporter.export(["clients"], incremental=True)
+
+    assert rows(again["clients"]["files"]) == 2
+
+
+def test_partitioned_export_of_object_ids_covers_every_row(tmp_path, fake_db_tool):
+    data = {"orders": [{"_id": ObjectId(), "order_id": f"O{i}"} for i in range(10)]}
+    exporter = SnapshotExporter(fake_db_tool(data), str(tmp_path), partitions=4, batch_size=3)
+
+    summary = exporter.export(["orders"])
+
+    assert rows(summary["orders"]["files"]) == 10
+    assert len(summary["orders"]["files"]) > 1
+
+
+def test_partitioned_export_with_mixed_id_types_keeps_every_row(tmp_path, fake_db_tool):
+    data = {"clients": [{"_id": f"c{i:03d}"} for i in range(5)] + [{"_id": ObjectId()} for _ in range(5)]}
+    exporter = SnapshotExporter(fake_db_tool(data), str(tmp_path), partitions=4)
+
+    summary = exporter.export(["clients"])
+
+    assert rows(summary["clients"]["files"]) == 10
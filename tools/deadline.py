@@ -0,0 +1,47 @@
+import time
+import contextvars
+
+
+_deadline = contextvars.ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a request has used up its time budget before a DB call.
+    """
+
+
+def run_with_deadline(deadline: float, fn, *args, **kwargs):
+    """
+    Run `fn` with `deadline` (a time.monotonic() timestamp) as the current request deadline.
+    Every MongoDBTool call made inside `fn` is bounded by the remaining budget.
+    """
+    token = _deadline.set(deadline)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_seconds():
+    """
+    Seconds left before the current deadline (0 once it has passed), or None when no deadline is set.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def remaining_ms():
+    """
+    Milliseconds left before the current deadline, or None when no deadline is set.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+
+    remaining = int((deadline - time.monotonic()) * 1000)
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return remaining
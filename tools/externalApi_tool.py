@@ -1,22 +1,236 @@
+import time
 import uuid
+import random
+import asyncio
 import datetime
+import threading
+import httpx
+
+
+class ExternalApiError(Exception):
+    """
+    Raised when the external service can't be reached or keeps failing.
+    """
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds. After that it is half-open: a single probe request
+    goes through, and its outcome closes or re-opens the breaker. A probe that
+    never reports back (e.g. cancelled) is replaced after another `reset_timeout`.
+
+    Only used from the tool's own event loop, so plain attributes are enough.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started = None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_timeout:
+            return False
+        if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+            return False
+        self._probe_started = now
+        return True
+
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started = None
+
+    def record_failure(self):
+        self._failures += 1
+        self._probe_started = None
+        if self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
 
 class ExternalApiTool:
-    def create_order(self,client_id: str, service_name: str):
-        return {
-            "order_id": str(uuid.uuid4()),
-            "client_id": client_id,
+    """
+    ExternalApiTool
+
+    Client for the external order/enquiry service.
+
+    Without a `base_url` the calls are answered in-process (the original mock
+    behaviour). With a `base_url` every call goes over HTTP through one shared
+    keep-alive connection pool, with bounded retries and jittered backoff, a
+    circuit breaker and optional request hedging (`hedge_after` seconds).
+
+    Each request carries an Idempotency-Key, so retried or hedged requests
+    don't create duplicate orders.
+    """
+
+    def __init__(self, base_url: str = None, timeout: float = 2.0, max_connections: int = 100,
+                 max_retries: int = 2, backoff_base: float = 0.1, backoff_max: float = 2.0,
+                 hedge_after: float = None, breaker: CircuitBreaker = None, transport=None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+        # Custom httpx transport, e.g. httpx.MockTransport in tests
+        self.transport = transport
+
+        self._loop = None
+        self._client = None
+        self._start_lock = threading.Lock()
+
+    # ================================
+    # PUBLIC API
+    # ================================
+
+    def create_order(self, client_id: str, service_name: str):
+        if not self.base_url:
+            return {
+                "order_id": str(uuid.uuid4()),
+                "client_id": client_id,
+                "service_name": service_name,
+                "status": "pending",
+                "created_at": datetime.datetime.now().isoformat(),
+            }
+        return self._run(self._create_order(client_id, service_name)).result()
+
+    def create_client_enquiry(self, name: str, email: str = None, phone: str = None):
+        if not self.base_url:
+            return {
+                "enquiry_id": str(uuid.uuid4()),
+                "name": name,
+                "email": email,
+                "phone": phone,
+                "status": "new",
+                "created_at": datetime.datetime.now().isoformat(),
+            }
+        return self._run(self._create_client_enquiry(name, email, phone)).result()
+
+    async def acreate_order(self, client_id: str, service_name: str):
+        """
+        Async variant of create_order; safe to await from any event loop.
+        """
+        if not self.base_url:
+            return self.create_order(client_id, service_name)
+        return await asyncio.wrap_future(self._run(self._create_order(client_id, service_name)))
+
+    async def acreate_client_enquiry(self, name: str, email: str = None, phone: str = None):
+        """
+        Async variant of create_client_enquiry; safe to await from any event loop.
+        """
+        if not self.base_url:
+            return self.create_client_enquiry(name, email, phone)
+        return await asyncio.wrap_future(self._run(self._create_client_enquiry(name, email, phone)))
+
+    def close(self):
+        if self._loop is not None:
+            self._run(self._client.aclose()).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+    # ================================
+    # HTTP PLUMBING
+    # ================================
+
+    def _run(self, coro):
+        """
+        Schedule `coro` on the tool's own event loop, which owns the connection pool.
+        """
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="external-api", daemon=True).start()
+                    self._client = httpx.AsyncClient(
+                        base_url=self.base_url,
+                        timeout=self.timeout,
+                        transport=self.transport,
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections,
+                        ),
+                    )
+                    self._loop = loop
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _create_order(self, client_id, service_name):
+        order_id = str(uuid.uuid4())
+        order = await self._post("/orders", {
+            "order_id": order_id,
+            "client_id": str(client_id),
             "service_name": service_name,
-            "status": "pending",
-            "created_at": datetime.datetime.now().isoformat(),
-        }
-    
-    def create_client_enquiry(self, name: str, email: str, ohone: str):
-        return {
-            "enquiry_id": str(uuid.uuid4()),
+        }, idempotency_key=order_id)
+        # Keep the caller's id type (e.g. ObjectId) so it still matches the clients collection.
+        order["client_id"] = client_id
+        return order
+
+    async def _create_client_enquiry(self, name, email, phone):
+        enquiry_id = str(uuid.uuid4())
+        return await self._post("/enquiries", {
+            "enquiry_id": enquiry_id,
             "name": name,
             "email": email,
             "phone": phone,
-            "status": "new",
-            "created_at": datetime.datetime.now().isoformat(),
-        }
\ No newline at end of file
+        }, idempotency_key=enquiry_id)
+
+    async def _post(self, path: str, payload: dict, idempotency_key: str):
+        headers = {"Idempotency-Key": idempotency_key}
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                raise ExternalApiError("External service unavailable (circuit open)")
+
+            try:
+                response = await self._send(path, payload, headers)
+                if response.status_code < 500 and response.status_code != 429:
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    return response.json()
+                last_error = ExternalApiError(f"External service returned {response.status_code}")
+            except httpx.TransportError as e:
+                last_error = ExternalApiError(f"External service request failed: {e}")
+
+            self.breaker.record_failure()
+            if attempt < self.max_retries:
+                # Full jitter keeps retrying clients from synchronising.
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                await asyncio.sleep(random.uniform(0, delay))
+
+        raise last_error
+
+    async def _send(self, path: str, payload: dict, headers: dict):
+        """
+        Send one request; if it hasn't finished after `hedge_after` seconds,
+        send a second copy and return whichever succeeds first.
+        """
+        if self.hedge_after is None:
+            return await self._client.post(path, json=payload, headers=headers)
+
+        first = asyncio.ensure_future(self._client.post(path, json=payload, headers=headers))
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_after)
+        if done:
+            return first.result()
+
+        second = asyncio.ensure_future(self._client.post(path, json=payload, headers=headers))
+        pending = {first, second}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
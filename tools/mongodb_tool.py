@@ -1,24 +1,70 @@
+import pymongo
 from pymongo import MongoClient
+from tools.deadline import remaining_ms
+
+
 class MongoDBTool:
     def __init__(self, uri: str, db_name: str):
         self.client = MongoClient(uri)
         self.db = self.client[db_name]
     
-    def find(self, collection_name: str, query: dict):
+    def find(self, collection_name: str, query: dict, projection: dict = None):
         collection = self.db[collection_name]
-        return list(collection.find(query))
+        cursor = collection.find(query, projection)
+        max_time_ms = remaining_ms()
+        if max_time_ms is not None:
+            cursor = cursor.max_time_ms(max_time_ms)
+        return list(cursor)
     
     def find_one(self,collection_name: str , query: dict):
         collection = self.db[collection_name]
+        max_time_ms = remaining_ms()
+        if max_time_ms is not None:
+            return collection.find_one(query, max_time_ms=max_time_ms)
         return collection.find_one(query)
     
     def aggregate(self, collection_name: str, pipeline: list):
         collection = self.db[collection_name]
+        max_time_ms = remaining_ms()
+        if max_time_ms is not None:
+            return list(collection.aggregate(pipeline, maxTimeMS=max_time_ms))
         return list(collection.aggregate(pipeline))
 
     def insert(self, collection_name: str, document: dict):
         collection = self.db[collection_name]
-        result = collection.insert_one(document)
+        max_time_ms = remaining_ms()
+        # Writes don't take maxTimeMS directly; pymongo.timeout bounds the whole operation.
+        with pymongo.timeout(max_time_ms / 1000 if max_time_ms is not None else None):
+            result = collection.insert_one(document)
         return result.inserted_id
 
-        
\ No newline at end of file
+    def iter_batches(self, collection_name: str, query: dict, batch_size: int = 5000):
+        """
+        Yield the matching documents in lists of at most `batch_size`, keeping memory bounded.
+        """
+        collection = self.db[collection_name]
+        batch = []
+        for document in collection.find(query).batch_size(batch_size):
+            batch.append(document)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def id_ranges(self, collection_name: str, query: dict, partitions: int):
+        """
+        Split the matching documents into roughly equal `_id` ranges.
+        Each range is {"min": ..., "max": ...}; max is exclusive except for the last range.
+        """
+        collection = self.db[collection_name]
+        buckets = collection.aggregate([
+            {"$match": query},
+            {"$bucketAuto": {"groupBy": "$_id", "buckets": partitions}}
+        ])
+        return [bucket["_id"] for bucket in buckets]
+
+    def watch(self, collection_names: list):
+        return self.db.watch([
+            {"$match": {"ns.coll": {"$in": collection_names}}}
+        ])
@@ -0,0 +1,175 @@
+import re
+import bisect
+import threading
+from datetime import datetime
+from pymongo.errors import PyMongoError
+
+
+class ReferenceDataCache:
+    """
+    ReferenceDataCache
+
+    Keeps the small, rarely changing reference collections (`courses` and
+    `classes`) in memory so the agents can answer course and class queries
+    without a Mongo round trip.
+
+    Classes are indexed by instructor, by status and by start_time order.
+    The snapshot is rebuilt every `refresh_interval` seconds, or on change
+    stream events when `use_change_streams` is enabled.
+
+    With consistency="strong" every read bypasses the cache and goes to Mongo.
+    """
+
+    COLLECTIONS = ("courses", "classes")
+
+    def __init__(self, db_tool, refresh_interval: float = 300, use_change_streams: bool = False,
+                 consistency: str = "eventual"):
+        if consistency not in ("eventual", "strong"):
+            raise ValueError(f"Unknown consistency mode: {consistency}")
+
+        self.db_tool = db_tool
+        self.refresh_interval = refresh_interval
+        self.use_change_streams = use_change_streams
+        self.consistency = consistency
+
+        self._snapshot = None
+        self._stop = threading.Event()
+        self._refresh_now = threading.Event()
+        self._thread = None
+
+    # ================================
+    # LIFECYCLE
+    # ================================
+
+    def start(self):
+        """
+        Load the initial snapshot and start the background refresher.
+        """
+        self.refresh()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="reference-cache", daemon=True)
+            self._thread.start()
+        if self.use_change_streams:
+            threading.Thread(target=self._watch, name="reference-cache-watch", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self._refresh_now.set()
+
+    def refresh(self):
+        """
+        Reload both collections and swap in a freshly indexed snapshot.
+        """
+        courses = self.db_tool.find("courses", {})
+        classes = self.db_tool.find("classes", {})
+        self._snapshot = _Snapshot(courses, classes)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._refresh_now.wait(self.refresh_interval)
+            self._refresh_now.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the last good snapshot until Mongo is back.
+                print(f"Reference cache refresh failed: {e}")
+
+    def _watch(self):
+        try:
+            with self.db_tool.watch(list(self.COLLECTIONS)) as stream:
+                for _ in stream:
+                    if self._stop.is_set():
+                        break
+                    self._refresh_now.set()
+        except PyMongoError as e:
+            # Change streams need a replica set; fall back to interval refresh.
+            print(f"Reference cache change stream unavailable: {e}")
+
+    # ================================
+    # QUERIES
+    # ================================
+
+    def courses(self):
+        """
+        Return all courses.
+        """
+        if self.consistency == "strong":
+            return self.db_tool.find("courses", {})
+        return [dict(c) for c in self._current().courses]
+
+    def upcoming_classes(self, since: str):
+        """
+        Return classes whose start_time is on or after `since` (ISO format).
+        """
+        if self.consistency == "strong":
+            return self.db_tool.find("classes", {"start_time": {"$gte": since}})
+
+        snapshot = self._current()
+        pos = bisect.bisect_left(snapshot.start_keys, since)
+        positions = sorted(snapshot.start_order[pos:])
+        return [dict(snapshot.classes[i]) for i in positions]
+
+    def filter_classes(self, instructor: str = None, status: str = None):
+        """
+        Return classes matching an instructor pattern (case-insensitive) and/or status.
+        """
+        if self.consistency == "strong":
+            filters = {}
+            if instructor:
+                filters["instructor"] = {"$regex": instructor, "$options": "i"}
+            if status:
+                filters["status"] = status
+            return self.db_tool.find("classes", filters)
+
+        snapshot = self._current()
+        positions = set(range(len(snapshot.classes)))
+
+        if instructor:
+            pattern = re.compile(instructor, re.IGNORECASE)
+            matched = set()
+            for name, idx in snapshot.by_instructor.items():
+                if pattern.search(name):
+                    matched.update(idx)
+            positions &= matched
+
+        if status:
+            positions &= set(snapshot.by_status.get(status, ()))
+
+        return [dict(snapshot.classes[i]) for i in sorted(positions)]
+
+    def _current(self):
+        if self._snapshot is None:
+            self.refresh()
+        return self._snapshot
+
+
+class _Snapshot:
+    """
+    Immutable, indexed view of the reference collections.
+    """
+
+    def __init__(self, courses: list, classes: list):
+        self.courses = courses
+        self.classes = classes
+        self.by_instructor = {}
+        self.by_status = {}
+
+        timed = []
+        for i, cls in enumerate(classes):
+            # Like Mongo's $regex, instructor patterns only ever match string values.
+            if isinstance(cls.get("instructor"), str):
+                self.by_instructor.setdefault(cls["instructor"], []).append(i)
+            if "status" in cls:
+                self.by_status.setdefault(cls["status"], []).append(i)
+
+            start = cls.get("start_time")
+            if isinstance(start, datetime):
+                start = start.isoformat()
+            if isinstance(start, str):
+                timed.append((start, i))
+
+        timed.sort()
+        self.start_keys = [key for key, _ in timed]
+        self.start_order = [i for _, i in timed]
@@ -0,0 +1,197 @@
+import os
+import time
+import uuid
+import sqlite3
+import threading
+from bson import json_util
+from tools.deadline import remaining_seconds
+
+# Private to the app: lives next to the code, not under a guessable world-writable /tmp name.
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "shared_cache.sqlite"
+)
+
+
+class CacheBackend:
+    """
+    Storage interface behind SharedCache. Implementations must be safe to use
+    from several processes at once (e.g. multiple uvicorn workers).
+    """
+
+    def get(self, key: str):
+        """
+        Return the stored JSON text for `key`, or None if missing or expired.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: float):
+        raise NotImplementedError
+
+    def acquire_lock(self, key: str, ttl: float):
+        """
+        Try to take the lock for `key`; return a token on success, None if someone else holds it.
+        The lock expires after `ttl` seconds so a crashed worker can't hold it forever.
+        """
+        raise NotImplementedError
+
+    def release_lock(self, key: str, token: str):
+        raise NotImplementedError
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    SQLite backend: a single file (WAL mode) shared by every worker on the host.
+    The directory is created 0700 and the file 0600 so other local users can't read or seed it.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or DEFAULT_CACHE_PATH
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        os.chmod(self.path, 0o600)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, token TEXT, expires_at REAL)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: float):
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (key, value, now + ttl))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def acquire_lock(self, key: str, ttl: float):
+        now = time.time()
+        token = str(uuid.uuid4())
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM locks WHERE key = ? AND expires_at <= ?", (key, now))
+            cursor = conn.execute("INSERT OR IGNORE INTO locks VALUES (?, ?, ?)", (key, token, now + ttl))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return token if cursor.rowcount == 1 else None
+
+    def release_lock(self, key: str, token: str):
+        self._connection().execute("DELETE FROM locks WHERE key = ? AND token = ?", (key, token))
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend for a redis-py compatible client (Redis or any stand-in exposing get/set/eval).
+    """
+
+    # Only delete the lock if we still own it.
+    RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, client, prefix: str = "multi_agent:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: str, ttl: float):
+        self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    def acquire_lock(self, key: str, ttl: float):
+        token = str(uuid.uuid4())
+        if self.client.set(self.prefix + "lock:" + key, token, nx=True, px=int(ttl * 1000)):
+            return token
+        return None
+
+    def release_lock(self, key: str, token: str):
+        self.client.eval(self.RELEASE_SCRIPT, 1, self.prefix + "lock:" + key, token)
+
+
+class SharedCache:
+    """
+    SharedCache
+
+    Result cache shared by all workers through a CacheBackend. When a key is
+    missing, only the worker holding the key's lock recomputes it; the others
+    wait for the result instead of running the same expensive query, but never
+    past the current request deadline.
+
+    Values are stored as Extended JSON (bson.json_util), so ObjectIds and
+    datetimes round-trip and nothing in the store is ever executed.
+
+    With consistency="strong" every call bypasses the cache and runs compute().
+    """
+
+    def __init__(self, backend: CacheBackend, lock_timeout: float = 30, poll_interval: float = 0.05,
+                 consistency: str = "eventual"):
+        if consistency not in ("eventual", "strong"):
+            raise ValueError(f"Unknown consistency mode: {consistency}")
+
+        self.backend = backend
+        self.consistency = consistency
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+
+    def get_or_compute(self, key: str, ttl: float, compute, should_cache=None):
+        """
+        Return the cached value for `key`, computing and storing it with `compute()` on a miss.
+        Results rejected by `should_cache` are returned but not stored.
+        """
+        if self.consistency == "strong":
+            return compute()
+
+        deadline = time.monotonic() + self.lock_timeout
+        # Non-raising: an expired deadline just means "don't wait"; compute() reports it the usual way.
+        budget = remaining_seconds()
+        if budget is not None:
+            deadline = min(deadline, time.monotonic() + budget)
+
+        while True:
+            cached = self.backend.get(key)
+            if cached is not None:
+                return json_util.loads(cached)
+
+            token = self.backend.acquire_lock(key, self.lock_timeout)
+            if token:
+                try:
+                    # Another worker may have filled the key between our get and the lock.
+                    cached = self.backend.get(key)
+                    if cached is not None:
+                        return json_util.loads(cached)
+
+                    value = compute()
+                    if should_cache is None or should_cache(value):
+                        self.backend.set(key, json_util.dumps(value), ttl)
+                    return value
+                finally:
+                    self.backend.release_lock(key, token)
+
+            now = time.monotonic()
+            if now >= deadline:
+                # The lock holder is taking too long; don't keep the request waiting.
+                return compute()
+            time.sleep(min(self.poll_interval, deadline - now))
@@ -0,0 +1,248 @@
+import os
+import uuid
+import fcntl
+import argparse
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from bson import ObjectId, json_util
+
+_STR = pa.string()
+_NUM = pa.float64()
+
+# Column layout of the collections created by data/mock_data_loader.py
+SCHEMAS = {
+    "clients": pa.schema([
+        ("_id", _STR), ("name", _STR), ("email", _STR), ("phone", _STR),
+        ("status", _STR), ("dob", _STR), ("created_at", _STR),
+    ]),
+    "orders": pa.schema([
+        ("_id", _STR), ("order_id", _STR), ("client_id", _STR), ("service_name", _STR),
+        ("status", _STR), ("amount", _NUM), ("created_at", _STR),
+    ]),
+    "payments": pa.schema([
+        ("_id", _STR), ("payment_id", _STR), ("order_id", _STR), ("paid", _NUM),
+        ("paid_at", _STR), ("method", _STR),
+    ]),
+    "classes": pa.schema([
+        ("_id", _STR), ("class_id", _STR), ("title", _STR), ("start_time", _STR),
+        ("instructor", _STR), ("status", _STR), ("room", _STR),
+    ]),
+    "enquiries": pa.schema([
+        ("_id", _STR), ("enquiry_id", _STR), ("client_name", _STR), ("name", _STR),
+        ("email", _STR), ("phone", _STR), ("status", _STR), ("created_at", _STR),
+    ]),
+    "courses": pa.schema([
+        ("_id", _STR), ("course_id", _STR), ("title", _STR), ("description", _STR),
+        ("category", _STR), ("completion_rate", _NUM),
+    ]),
+    "attendance": pa.schema([
+        ("_id", _STR), ("client_id", _STR), ("class", _STR), ("present", pa.bool_()),
+    ]),
+}
+
+FORMATS = ("parquet", "arrow")
+
+
+class SnapshotExporter:
+    """
+    SnapshotExporter
+
+    Streams collections to compressed columnar files (Parquet or Arrow IPC).
+
+    Each collection is split into `_id` ranges that are exported in parallel,
+    one file per range (a single range if the collection mixes `_id` types), reading `batch_size` documents at a time so memory
+    stays bounded. The highest exported `_id` is stored per collection in
+    `_watermarks.json`; incremental exports only read documents above it.
+    Only collections whose `_id`s are all ObjectIds get a watermark; others
+    are exported in full every time.
+
+    Exports sharing an `output_dir` are serialized with a file lock.
+    """
+
+    def __init__(self, db_tool, output_dir: str, file_format: str = "parquet",
+                 partitions: int = 4, batch_size: int = 5000):
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported format: {file_format}")
+
+        self.db_tool = db_tool
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.partitions = partitions
+        self.batch_size = batch_size
+
+    def export(self, collections: list = None, incremental: bool = False):
+        """
+        Export the given collections (all of them by default) and return a summary per collection.
+        """
+        collections = collections or list(SCHEMAS)
+        unknown = [c for c in collections if c not in SCHEMAS]
+        if unknown:
+            raise ValueError(f"Unknown collections: {', '.join(unknown)}")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, "_export.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                return self._export(collections, incremental)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # ================================
+    # INTERNALS
+    # ================================
+
+    def _export(self, collections: list, incremental: bool):
+        watermarks = self._read_watermarks()
+        # Unique per run so back-to-back exports never overwrite each other's files.
+        run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ") + "-" + uuid.uuid4().hex[:8]
+        summary = {}
+
+        for collection in collections:
+            query = {}
+            if incremental and collection in watermarks:
+                query = {"_id": {"$gt": watermarks[collection]}}
+
+            result = self._export_collection(collection, query, run_id)
+            if result["watermark"] is not None:
+                watermarks[collection] = result["watermark"]
+            elif result["rows"] and not result["resumable"]:
+                watermarks.pop(collection, None)
+            # Persist after every collection so a failure later on doesn't lose progress.
+            self._write_watermarks(watermarks)
+            summary[collection] = {"rows": result["rows"], "files": result["files"]}
+
+        return summary
+
+    def _export_collection(self, collection: str, query: dict, run_id: str):
+        directory = os.path.join(self.output_dir, collection, run_id)
+
+        ranges = [None]
+        if self.partitions > 1:
+            buckets = self.db_tool.id_ranges(collection, query, self.partitions)
+            # Mongo range queries only match _ids of the bound's type, so a bucket spanning
+            # two types (e.g. "c003" .. ObjectId) would silently match nothing.
+            if all(type(b["min"]) is type(b["max"]) for b in buckets):
+                ranges = buckets
+
+        jobs = []
+        for i, bounds in enumerate(ranges):
+            range_query = dict(query)
+            if bounds is not None:
+                upper = "$lte" if i == len(ranges) - 1 else "$lt"
+                range_query = {"$and": [query, {"_id": {"$gte": bounds["min"], upper: bounds["max"]}}]}
+            path = os.path.join(directory, f"part-{i:04d}.{self.file_format}")
+            jobs.append((collection, range_query, path))
+
+        with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as pool:
+            parts = list(pool.map(lambda job: self._export_range(*job), jobs))
+
+        resumable = all(part["resumable"] for part in parts)
+        ids = [part["max_id"] for part in parts if part["max_id"] is not None]
+        return {
+            "rows": sum(part["rows"] for part in parts),
+            "files": [part["path"] for part in parts if part["rows"]],
+            "watermark": max(ids) if ids and resumable else None,
+            "resumable": resumable,
+        }
+
+    def _export_range(self, collection: str, query: dict, path: str):
+        schema = SCHEMAS[collection]
+        writer = None
+        rows = 0
+        max_id = None
+        # Mongo only compares _ids of the same type, so only ObjectIds can serve as a watermark.
+        resumable = True
+
+        try:
+            for docs in self.db_tool.iter_batches(collection, query, self.batch_size):
+                if writer is None:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    writer = self._open_writer(path, schema)
+
+                writer.write_batch(_to_record_batch(docs, schema))
+                rows += len(docs)
+                ids = [d["_id"] for d in docs]
+                if not all(isinstance(i, ObjectId) for i in ids):
+                    resumable = False
+                elif resumable:
+                    max_id = max(ids) if max_id is None else max(max_id, *ids)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return {"path": path, "rows": rows, "max_id": max_id if resumable else None, "resumable": resumable}
+
+    def _open_writer(self, path: str, schema):
+        if self.file_format == "parquet":
+            return pq.ParquetWriter(path, schema, compression="zstd")
+        options = ipc.IpcWriteOptions(compression="zstd")
+        return ipc.new_file(path, schema, options=options)
+
+    def _watermark_path(self):
+        return os.path.join(self.output_dir, "_watermarks.json")
+
+    def _read_watermarks(self):
+        try:
+            with open(self._watermark_path()) as f:
+                return json_util.loads(f.read())
+        except FileNotFoundError:
+            return {}
+
+    def _write_watermarks(self, watermarks: dict):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = self._watermark_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json_util.dumps(watermarks))
+        os.replace(tmp_path, self._watermark_path())
+
+
+def _to_record_batch(docs: list, schema):
+    columns = {}
+    for field in schema:
+        values = [d.get(field.name) for d in docs]
+        if field.type == pa.float64():
+            values = [float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else None for v in values]
+        elif field.type == pa.bool_():
+            values = [v if isinstance(v, bool) else None for v in values]
+        else:
+            values = [_as_string(v) for v in values]
+        columns[field.name] = values
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def _as_string(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def main():
+    from dotenv import load_dotenv
+    from tools.mongodb_tool import MongoDBTool
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Export collections to columnar files")
+    parser.add_argument("collections", nargs="*", help="collections to export (default: all)")
+    parser.add_argument("--out", default=os.getenv("EXPORT_DIR", "exports"))
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--incremental", action="store_true", help="only export documents past the last watermark")
+    args = parser.parse_args()
+
+    db_tool = MongoDBTool(os.getenv("MONGO_URI"), os.getenv("MONGO_DB"))
+    exporter = SnapshotExporter(db_tool, args.out, args.format, args.partitions, args.batch_size)
+    summary = exporter.export(args.collections, incremental=args.incremental)
+
+    for collection, result in summary.items():
+        print(f"{collection}: {result['rows']} rows -> {len(result['files'])} file(s)")
+
+
+if __name__ == "__main__":
+    main()